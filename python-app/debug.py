@@ -1,44 +1,140 @@
 #!/usr/bin/env python3
 
+# Run as `python -m debug` so the bytecode cached in __pycache__ is reused;
+# `python debug.py` always recompiles the script from source.
+
+import functools
 import os
 import sys
-import traceback
-
-# Print environment for debugging
-print("Python version:", sys.version)
-print("DISPLAY:", os.environ.get('DISPLAY'))
-print("Current directory:", os.getcwd())
-print("Directory contents:", os.listdir())
-
-try:
-    # Try to import required modules
-    import tkinter as tk
-    print("Tkinter imported successfully")
-    
-    # Try to initialize a basic Tk window
+
+
+# The environment doesn't change while the script runs, so read it once
+@functools.lru_cache(maxsize=1)
+def get_display():
+    return os.environ.get('DISPLAY')
+
+
+@functools.lru_cache(maxsize=1)
+def get_cwd_listing():
+    cwd = os.getcwd()
+    return cwd, tuple(os.listdir(cwd))
+
+
+def _print_exc(e):
+    # Full tracebacks are only worth importing traceback for when asked to
+    if os.environ.get('PLC_DEBUG_VERBOSE'):
+        import traceback
+        traceback.print_exc()
+    else:
+        print(f"{type(e).__name__}: {e}")
+
+
+def _print_env():
+    # Print environment for debugging
+    display = get_display()
+    cwd, listing = get_cwd_listing()
+    print("Python version:", sys.version)
+    print("DISPLAY:", display)
+    print("Current directory:", cwd)
+    print("Directory contents:", list(listing))
+
+
+def _cached_import(module_path, attr=None):
+    # Reuse an already-imported module instead of going through the finders
+    module = sys.modules.get(module_path)
+    if (module is None or getattr(module, '__spec__', None) is None
+            or getattr(module.__spec__, '_initializing', False)):
+        import importlib
+        module = importlib.import_module(module_path)
+    return module if attr is None else getattr(module, attr)
+
+
+def _probe_tk():
+    # Without a display Tk() can only fail, so don't pay for loading Tcl/Tk
+    if (sys.platform != 'win32' and not get_display()
+            and not os.environ.get('WAYLAND_DISPLAY')):
+        print("Tk probe skipped: no display")
+        return
+
+    # Try to import tkinter and initialize a basic Tk window
+    try:
+        import tkinter as tk
+        print("Tkinter imported successfully")
+    except Exception as e:
+        print("Error importing tkinter:")
+        _print_exc(e)
+        return
+
     try:
         root = tk.Tk()
         print("Tk initialized successfully")
         root.destroy()
     except Exception as e:
-        print("Tk initialization error:", str(e))
-        traceback.print_exc()
-        
+        print("Tk initialization error:")
+        _print_exc(e)
+
+
+def _probe_pymodbus():
     # Try to import pymodbus
-    from pymodbus.server.sync import StartTcpServer
-    print("Pymodbus imported successfully")
-    
-    # Now try to run the actual plc_simulator
+    try:
+        _cached_import('pymodbus.server.async_io')
+        print("Pymodbus imported successfully")
+    except Exception as e:
+        print("Error importing pymodbus:")
+        _print_exc(e)
+
+
+def _probe_plc_simulator():
+    # Now try to import the actual plc_simulator
     try:
         print("Attempting to import plc_simulator...")
-        from plc_simulator import PLCSimulator
+        _cached_import('plc_simulator', 'PLCSimulator')
         print("Import successful!")
     except Exception as e:
-        print("Error importing plc_simulator:", str(e))
-        traceback.print_exc()
-        
-except Exception as e:
-    print("General import error:", str(e))
-    traceback.print_exc()
+        print("Error importing plc_simulator:")
+        _print_exc(e)
+
+
+# Probes run in order; each can be skipped with --skip-<name>
+PROBES = [
+    ('tk', _probe_tk),
+    ('pymodbus', _probe_pymodbus),
+    ('plc-simulator', _probe_plc_simulator),
+]
+
+# Symbols resolved on first attribute access so importing this module
+# doesn't pull in tkinter or pymodbus
+_LAZY_ATTRS = {
+    'tk': ('tkinter', None),
+    'StartTcpServer': ('pymodbus.server.async_io', 'StartTcpServer'),
+    'PLCSimulator': ('plc_simulator', 'PLCSimulator'),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _cached_import(*_LAZY_ATTRS[name])
+    globals()[name] = value
+    return value
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    skipped = {arg[len('--skip-'):] for arg in argv if arg.startswith('--skip-')}
+
+    _print_env()
+    # Each probe reports its own errors, so one failure doesn't stop the rest
+    for name, probe in PROBES:
+        if name in skipped:
+            print(f"Skipping {name} probe")
+            continue
+        probe()
+
+    print("Debug script completed")
+    return 0
+
 
-print("Debug script completed")
\ No newline at end of file
+if __name__ == '__main__':
+    sys.exit(main())
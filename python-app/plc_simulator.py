@@ -1,12 +1,95 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import asyncio
+import bisect
+import logging
+import os
 import threading
+from collections import deque, namedtuple
 import time
 import random
-from pymodbus.server.sync import StartTcpServer
+from pymodbus.server.async_io import StartTcpServer as StartAsyncTcpServer
 from pymodbus.datastore import ModbusSequentialDataBlock
 from pymodbus.datastore import ModbusSlaveContext, ModbusServerContext
 
+log = logging.getLogger('plc')
+
+# Holding register addresses
+R_PUMP_CTRL = 1     # Pump control (0=stop, 1=start)
+R_PUMP_STATUS = 2   # Pump status (0=stopped, 1=running)
+R_TEMP = 10         # Temperature
+R_PRESSURE = 11     # Pressure
+R_FLOW = 12         # Flow rate
+R_STATIC_HEAD = 13  # Static head
+R_FRICTION = 14     # Friction losses
+R_DIAMETER = 15     # Suction pipe diameter
+R_ELEV = 16         # Elevation
+
+# Register counts per engineering unit (e.g. 25.0 °C is stored as 250)
+SCALE_TEMP = 10          # 0.1 °C
+SCALE_PRESSURE = 100     # 0.01 bar
+SCALE_FLOW = 10          # 0.1 m³/h
+SCALE_STATIC_HEAD = 10   # 0.1 m
+SCALE_FRICTION = 10      # 0.1 m
+SCALE_DIAMETER = 1       # 1 mm
+SCALE_ELEV = 10          # 0.1 m
+
+# The store is polled faster than the widgets are redrawn
+POLL_INTERVAL_MS = 100
+REDRAW_INTERVAL_MS = 500
+
+# Approximate conversion from bar to meters of water
+_BAR_TO_M_WATER = 10.2
+
+# Vapor pressure (bar) = 0.0061 * (°F) ** 2 / 100
+_VAPOR_PRESSURE_COEFF = 0.0061 / 100
+
+# 8x15DMX-3 NPSHr curve (flow m³/h, NPSHr m) - matches the JavaScript implementation
+_NPSHR_CURVE = (
+    (0, 0.5), (100, 3.2), (200, 6.0), (300, 9.1), (400, 12.4),
+    (480, 16.4), (550, 15.8), (650, 15.0), (750, 14.2), (850, 14.0),
+    (950, 14.4), (1050, 15.2), (1100, 16.0), (1150, 17.5), (1200, 19.0)
+)
+_NPSHR_BOUNDS = tuple(flow for flow, _ in _NPSHR_CURVE)
+
+# (base NPSHr, slope per m³/h, segment start flow) for each bisect index:
+# index 0 is flow <= 0, the last index extrapolates beyond 1200 m³/h
+_NPSHR_SEGMENTS = (
+    ((0.5, 0.0, 0),)
+    + tuple((lo_npshr, (hi_npshr - lo_npshr) / (hi_flow - lo_flow), lo_flow)
+            for (lo_flow, lo_npshr), (hi_flow, hi_npshr)
+            in zip(_NPSHR_CURVE, _NPSHR_CURVE[1:]))
+    + ((19.0, 2.0 / 100, 1200),)
+)
+
+def compute_npsh(temp, pressure, flow, static_head, friction_loss):
+    """Return (NPSHa, NPSHr, margin) in meters for the given operating data"""
+    # Simple vapor pressure calculation (approximate), in bar
+    vapor_pressure = _VAPOR_PRESSURE_COEFF * (1.8 * temp + 32) ** 2
+    
+    # Convert pressure from bar to meters of water
+    pressure_m = pressure * _BAR_TO_M_WATER
+    
+    # Calculate NPSHa
+    npsha = pressure_m - (vapor_pressure * _BAR_TO_M_WATER) + static_head - friction_loss
+    
+    # Use the 8x15DMX-3 NPSHr curve - piecewise linear between breakpoints
+    base, slope, flow_lo = _NPSHR_SEGMENTS[bisect.bisect_left(_NPSHR_BOUNDS, flow)]
+    npshr = base + (flow - flow_lo) * slope
+    
+    # Calculate margin
+    return npsha, npshr, npsha - npshr
+
+# Register, scale factor, display format, variable and value label of a control
+ControlSpec = namedtuple('ControlSpec', 'reg scale fmt var display')
+
+# Control, accepted range and keystroke validator of an Entry widget
+EntrySpec = namedtuple('EntrySpec', 'control_type min_val max_val validate')
+
+# Registers shown in the register monitor, in display order
+_MONITORED_REGS = (R_PUMP_CTRL, R_PUMP_STATUS, R_TEMP, R_PRESSURE, R_FLOW,
+                   R_STATIC_HEAD, R_FRICTION, R_DIAMETER, R_ELEV)
+
 class PLCSimulator:
     def __init__(self, root):
         self.root = root
@@ -17,34 +100,77 @@ class PLCSimulator:
         # Server configuration
         self.ip_address = tk.StringVar(value="0.0.0.0")
         self.port = tk.IntVar(value=502)
-        self.server_running = False
         self.server_thread = None
-        
-        # PLC registers with initial values - updated to match 8x15DMX-3 pump
-        self.register_values = {
-            1: 0,   # Pump control (0=stop, 1=start)
-            2: 0,   # Pump status (0=stopped, 1=running)
-            10: 250, # Temperature (25.0°C)
-            11: 300, # Pressure (3.00 bar)
-            12: 0,   # Flow rate (0.0 m³/h)
-            13: 20,  # Static head (2.0 m)
-            14: 5,   # Friction losses (0.5 m)
-            15: 150, # Suction pipe diameter (150 mm) - updated
-            16: 10   # Elevation (1.0 m)
-        }
-        
-        # Create the modbus context
+        self._server_loop = None
+        self._serve_task = None
+        # Set by stop_server; checked by the server thread as it starts up
+        self._server_stop = threading.Event()
+        # Exception that ended the server thread, if any
+        self._server_error = None
+        self._watch_after_id = None
+        
+        # Last rounded NPSH values shown in the status frame
+        self._last_npsha = None
+        self._last_npshr = None
+        self._last_margin = None
+        # Inputs of the last NPSH calculation
+        self._npsh_inputs = None
+        
+        # Slider values waiting to be written out once Tk is idle
+        self._pending = {}
+        self._flush_after_id = None
+        
+        # Text last written to each value label
+        self._label_text = {}
+        
+        # Register value each slider variable was last set to, so syncing
+        # the sliders doesn't need a Tcl round-trip to read the variable
+        self._last_reg = {}
+        
+        # Set when register_values changes; cleared by the next redraw
+        self._dirty = True
+        
+        # Pump state the canvas and buttons were last updated for
+        self._last_pump_running = None
+        
+        # Registers the user rarely changes; one of them is read per poll
+        self._slow_regs = deque((R_STATIC_HEAD, R_FRICTION, R_DIAMETER, R_ELEV))
+        
+        # PLC registers indexed by register number, with initial values - updated to match 8x15DMX-3 pump
+        self.register_values = [0] * (R_ELEV + 1)
+        self.register_values[R_PUMP_CTRL] = 0         # Pump control (0=stop, 1=start)
+        self.register_values[R_PUMP_STATUS] = 0       # Pump status (0=stopped, 1=running)
+        self.register_values[R_TEMP] = 250            # Temperature (25.0°C)
+        self.register_values[R_PRESSURE] = 300        # Pressure (3.00 bar)
+        self.register_values[R_FLOW] = 0              # Flow rate (0.0 m³/h)
+        self.register_values[R_STATIC_HEAD] = 20      # Static head (2.0 m)
+        self.register_values[R_FRICTION] = 5          # Friction losses (0.5 m)
+        self.register_values[R_DIAMETER] = 150        # Suction pipe diameter (150 mm) - updated
+        self.register_values[R_ELEV] = 10             # Elevation (1.0 m)
+        
+        # Create the modbus context. The slave context shifts every address
+        # by one (it isn't in zero_mode), so starting the block at 1 puts
+        # register N at index N of the block's value list
         self.store = ModbusSlaveContext(
-            hr=ModbusSequentialDataBlock(0, [0] * 100)
+            hr=ModbusSequentialDataBlock(1, [0] * 100)
         )
         self.context = ModbusServerContext(slaves=self.store, single=True)
         
+        # The UI thread writes straight into the holding register list rather
+        # than going through setValues; single item and slice assignments
+        # are atomic with respect to the server thread
+        self._hr_values = self.store.store['h'].values
+        
+        # One validation command shared by every Entry widget, which looks up
+        # the widget's control and range by its Tk path name
+        self._entry_controls = {}
+        self._vcmd = (self.root.register(self._validate_entry), '%P', '%W')
+        
         # Initialize UI
         self.create_ui()
         
         # Update initial values in the context
-        for reg, value in self.register_values.items():
-            self.store.setValues(3, reg, [value])  # 3 = Holding Registers
+        self._hr_values[:len(self.register_values)] = self.register_values
     
         # Automatically start the server on launch
         self.start_server()
@@ -88,6 +214,7 @@ class PLCSimulator:
         
         self.pump_canvas = tk.Canvas(pump_frame, width=150, height=150)
         self.pump_canvas.pack(padx=20, pady=20)
+        self._build_pump_static()
         self.draw_pump(running=False)
         
         # Pump control buttons
@@ -121,22 +248,24 @@ class PLCSimulator:
         advanced_frame = ttk.Frame(operating_tabs)
         operating_tabs.add(advanced_frame, text="Advanced Parameters")
         
+        # Operating data variables hold raw register values, so the sliders
+        # work in register units (e.g. tenths of °C) and need no float scaling
         # Basic operating data variables
-        self.temp_var = tk.DoubleVar(value=25.0)
-        self.pressure_var = tk.DoubleVar(value=3.0)
-        self.flow_var = tk.DoubleVar(value=0.0)
+        self.temp_var = tk.IntVar(value=250)      # 25.0 °C
+        self.pressure_var = tk.IntVar(value=300)  # 3.00 bar
+        self.flow_var = tk.IntVar(value=0)        # 0.0 m³/h
         
         # Advanced operating data variables
-        self.static_head_var = tk.DoubleVar(value=2.0)
-        self.friction_loss_var = tk.DoubleVar(value=0.5)
-        self.pipe_diameter_var = tk.DoubleVar(value=150)  # Updated to 150 mm
-        self.elevation_var = tk.DoubleVar(value=1.0)
+        self.static_head_var = tk.IntVar(value=20)     # 2.0 m
+        self.friction_loss_var = tk.IntVar(value=5)    # 0.5 m
+        self.pipe_diameter_var = tk.IntVar(value=150)  # Updated to 150 mm
+        self.elevation_var = tk.IntVar(value=10)       # 1.0 m
         
         # Basic operating data controls
         ttk.Label(basic_frame, text="Temperature (°C):").grid(row=0, column=0, padx=5, pady=10, sticky=tk.W)
         self.temp_display = ttk.Label(basic_frame, text="25.0")
         self.temp_display.grid(row=0, column=1, padx=5, pady=10, sticky=tk.W)
-        temp_slider = ttk.Scale(basic_frame, from_=0, to=100, variable=self.temp_var, 
+        temp_slider = ttk.Scale(basic_frame, from_=0, to=1000, variable=self.temp_var, 
                              command=lambda v: self.update_register_from_slider('temp'))
         temp_slider.grid(row=0, column=2, padx=5, pady=10, sticky=tk.EW)
         
@@ -144,17 +273,13 @@ class PLCSimulator:
         temp_entry = ttk.Entry(basic_frame, width=8)
         temp_entry.grid(row=0, column=3, padx=5, pady=10)
         temp_entry.insert(0, "25.0")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 0, 100)), '%P')
-        temp_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        temp_entry.bind('<Return>', lambda e: self.update_from_entry(temp_entry, 'temp', 0, 100))
-        temp_entry.bind('<FocusOut>', lambda e: self.update_from_entry(temp_entry, 'temp', 0, 100))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(temp_entry, 'temp', 0, 100)
         
         ttk.Label(basic_frame, text="Pressure (bar):").grid(row=1, column=0, padx=5, pady=10, sticky=tk.W)
         self.pressure_display = ttk.Label(basic_frame, text="3.0")
         self.pressure_display.grid(row=1, column=1, padx=5, pady=10, sticky=tk.W)
-        pressure_slider = ttk.Scale(basic_frame, from_=0, to=10, variable=self.pressure_var,
+        pressure_slider = ttk.Scale(basic_frame, from_=0, to=1000, variable=self.pressure_var,
                                  command=lambda v: self.update_register_from_slider('pressure'))
         pressure_slider.grid(row=1, column=2, padx=5, pady=10, sticky=tk.EW)
         
@@ -162,17 +287,13 @@ class PLCSimulator:
         pressure_entry = ttk.Entry(basic_frame, width=8)
         pressure_entry.grid(row=1, column=3, padx=5, pady=10)
         pressure_entry.insert(0, "3.0")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 0, 10)), '%P')
-        pressure_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        pressure_entry.bind('<Return>', lambda e: self.update_from_entry(pressure_entry, 'pressure', 0, 10))
-        pressure_entry.bind('<FocusOut>', lambda e: self.update_from_entry(pressure_entry, 'pressure', 0, 10))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(pressure_entry, 'pressure', 0, 10)
         
         ttk.Label(basic_frame, text="Flow Rate (m³/h):").grid(row=2, column=0, padx=5, pady=10, sticky=tk.W)
         self.flow_display = ttk.Label(basic_frame, text="0.0")
         self.flow_display.grid(row=2, column=1, padx=5, pady=10, sticky=tk.W)
-        self.flow_slider = ttk.Scale(basic_frame, from_=0, to=1200, variable=self.flow_var,  # Updated to 1200 m³/h
+        self.flow_slider = ttk.Scale(basic_frame, from_=0, to=12000, variable=self.flow_var,  # Updated to 1200.0 m³/h
                                   command=lambda v: self.update_register_from_slider('flow'))
         self.flow_slider.grid(row=2, column=2, padx=5, pady=10, sticky=tk.EW)
         
@@ -180,18 +301,14 @@ class PLCSimulator:
         flow_entry = ttk.Entry(basic_frame, width=8)
         flow_entry.grid(row=2, column=3, padx=5, pady=10)
         flow_entry.insert(0, "0.0")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 0, 1200)), '%P')
-        flow_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        flow_entry.bind('<Return>', lambda e: self.update_from_entry(flow_entry, 'flow', 0, 1200))
-        flow_entry.bind('<FocusOut>', lambda e: self.update_from_entry(flow_entry, 'flow', 0, 1200))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(flow_entry, 'flow', 0, 1200)
         
         # Advanced operating data controls
         ttk.Label(advanced_frame, text="Static Head (m):").grid(row=0, column=0, padx=5, pady=10, sticky=tk.W)
         self.static_head_display = ttk.Label(advanced_frame, text="2.0")
         self.static_head_display.grid(row=0, column=1, padx=5, pady=10, sticky=tk.W)
-        static_head_slider = ttk.Scale(advanced_frame, from_=0, to=10, variable=self.static_head_var,
+        static_head_slider = ttk.Scale(advanced_frame, from_=0, to=100, variable=self.static_head_var,
                                     command=lambda v: self.update_register_from_slider('static_head'))
         static_head_slider.grid(row=0, column=2, padx=5, pady=10, sticky=tk.EW)
         
@@ -199,17 +316,13 @@ class PLCSimulator:
         static_head_entry = ttk.Entry(advanced_frame, width=8)
         static_head_entry.grid(row=0, column=3, padx=5, pady=10)
         static_head_entry.insert(0, "2.0")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 0, 10)), '%P')
-        static_head_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        static_head_entry.bind('<Return>', lambda e: self.update_from_entry(static_head_entry, 'static_head', 0, 10))
-        static_head_entry.bind('<FocusOut>', lambda e: self.update_from_entry(static_head_entry, 'static_head', 0, 10))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(static_head_entry, 'static_head', 0, 10)
         
         ttk.Label(advanced_frame, text="Friction Losses (m):").grid(row=1, column=0, padx=5, pady=10, sticky=tk.W)
         self.friction_loss_display = ttk.Label(advanced_frame, text="0.5")
         self.friction_loss_display.grid(row=1, column=1, padx=5, pady=10, sticky=tk.W)
-        friction_loss_slider = ttk.Scale(advanced_frame, from_=0, to=5, variable=self.friction_loss_var,
+        friction_loss_slider = ttk.Scale(advanced_frame, from_=0, to=50, variable=self.friction_loss_var,
                                       command=lambda v: self.update_register_from_slider('friction_loss'))
         friction_loss_slider.grid(row=1, column=2, padx=5, pady=10, sticky=tk.EW)
         
@@ -217,12 +330,8 @@ class PLCSimulator:
         friction_loss_entry = ttk.Entry(advanced_frame, width=8)
         friction_loss_entry.grid(row=1, column=3, padx=5, pady=10)
         friction_loss_entry.insert(0, "0.5")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 0, 5)), '%P')
-        friction_loss_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        friction_loss_entry.bind('<Return>', lambda e: self.update_from_entry(friction_loss_entry, 'friction_loss', 0, 5))
-        friction_loss_entry.bind('<FocusOut>', lambda e: self.update_from_entry(friction_loss_entry, 'friction_loss', 0, 5))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(friction_loss_entry, 'friction_loss', 0, 5)
         
         ttk.Label(advanced_frame, text="Suction Pipe Diameter (mm):").grid(row=2, column=0, padx=5, pady=10, sticky=tk.W)
         self.pipe_diameter_display = ttk.Label(advanced_frame, text="150")  # Updated to 150
@@ -235,17 +344,13 @@ class PLCSimulator:
         pipe_diameter_entry = ttk.Entry(advanced_frame, width=8)
         pipe_diameter_entry.grid(row=2, column=3, padx=5, pady=10)
         pipe_diameter_entry.insert(0, "150")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 50, 300)), '%P')
-        pipe_diameter_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        pipe_diameter_entry.bind('<Return>', lambda e: self.update_from_entry(pipe_diameter_entry, 'pipe_diameter', 50, 300))
-        pipe_diameter_entry.bind('<FocusOut>', lambda e: self.update_from_entry(pipe_diameter_entry, 'pipe_diameter', 50, 300))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(pipe_diameter_entry, 'pipe_diameter', 50, 300, is_int=True)
         
         ttk.Label(advanced_frame, text="Suction Elevation (m):").grid(row=3, column=0, padx=5, pady=10, sticky=tk.W)
         self.elevation_display = ttk.Label(advanced_frame, text="1.0")
         self.elevation_display.grid(row=3, column=1, padx=5, pady=10, sticky=tk.W)
-        elevation_slider = ttk.Scale(advanced_frame, from_=0, to=10, variable=self.elevation_var,
+        elevation_slider = ttk.Scale(advanced_frame, from_=0, to=100, variable=self.elevation_var,
                                    command=lambda v: self.update_register_from_slider('elevation'))
         elevation_slider.grid(row=3, column=2, padx=5, pady=10, sticky=tk.EW)
         
@@ -253,12 +358,19 @@ class PLCSimulator:
         elevation_entry = ttk.Entry(advanced_frame, width=8)
         elevation_entry.grid(row=3, column=3, padx=5, pady=10)
         elevation_entry.insert(0, "1.0")  # Default value
-        # Configure validation
-        vcmd = (self.root.register(lambda val: self.validate_numeric_input(val, 0, 10)), '%P')
-        elevation_entry.config(validate='key', validatecommand=vcmd)
-        # Bind to update on Enter key or focus out
-        elevation_entry.bind('<Return>', lambda e: self.update_from_entry(elevation_entry, 'elevation', 0, 10))
-        elevation_entry.bind('<FocusOut>', lambda e: self.update_from_entry(elevation_entry, 'elevation', 0, 10))
+        # Validate keystrokes and update on Enter key or focus out
+        self._setup_entry(elevation_entry, 'elevation', 0, 10)
+        
+        # Operating data controls by control type
+        self._controls = {
+            'temp': ControlSpec(R_TEMP, SCALE_TEMP, '.1f', self.temp_var, self.temp_display),
+            'pressure': ControlSpec(R_PRESSURE, SCALE_PRESSURE, '.2f', self.pressure_var, self.pressure_display),
+            'flow': ControlSpec(R_FLOW, SCALE_FLOW, '.1f', self.flow_var, self.flow_display),
+            'static_head': ControlSpec(R_STATIC_HEAD, SCALE_STATIC_HEAD, '.1f', self.static_head_var, self.static_head_display),
+            'friction_loss': ControlSpec(R_FRICTION, SCALE_FRICTION, '.1f', self.friction_loss_var, self.friction_loss_display),
+            'pipe_diameter': ControlSpec(R_DIAMETER, SCALE_DIAMETER, '.0f', self.pipe_diameter_var, self.pipe_diameter_display),
+            'elevation': ControlSpec(R_ELEV, SCALE_ELEV, '.1f', self.elevation_var, self.elevation_display)
+        }
         
         # Add status frame to display calculated NPSH
         status_frame = ttk.LabelFrame(right_panel, text="NPSH Calculation Status")
@@ -323,50 +435,80 @@ class PLCSimulator:
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
         
-        # Add registers to treeview
-        self.tree.insert('', 'end', values=('1', 'Pump Control', '0 (Stop)', '0'))
-        self.tree.insert('', 'end', values=('2', 'Pump Status', '0 (Stopped)', '0'))
-        self.tree.insert('', 'end', values=('10', 'Temperature', '25.0 °C', '250'))
-        self.tree.insert('', 'end', values=('11', 'Pressure', '3.00 bar', '300'))
-        self.tree.insert('', 'end', values=('12', 'Flow Rate', '0.0 m³/h', '0'))
-        self.tree.insert('', 'end', values=('13', 'Static Head', '2.0 m', '20'))
-        self.tree.insert('', 'end', values=('14', 'Friction Losses', '0.5 m', '5'))
-        self.tree.insert('', 'end', values=('15', 'Pipe Diameter', '150 mm', '150'))
-        self.tree.insert('', 'end', values=('16', 'Elevation', '1.0 m', '10'))
+        # Static description column for each treeview row
+        self._tree_labels = {
+            R_PUMP_CTRL: 'Pump Control',
+            R_PUMP_STATUS: 'Pump Status',
+            R_TEMP: 'Temperature',
+            R_PRESSURE: 'Pressure',
+            R_FLOW: 'Flow Rate',
+            R_STATIC_HEAD: 'Static Head',
+            R_FRICTION: 'Friction Losses',
+            R_DIAMETER: 'Pipe Diameter',
+            R_ELEV: 'Elevation',
+        }
+        
+        # Turns a raw register value into the text of its Value column
+        self._formatters = {
+            R_PUMP_CTRL: lambda v: '1 (Start)' if v == 1 else '0 (Stop)',
+            R_PUMP_STATUS: lambda v: '1 (Running)' if v == 1 else '0 (Stopped)',
+            R_TEMP: lambda v: f"{v / SCALE_TEMP:.1f} °C",
+            R_PRESSURE: lambda v: f"{v / SCALE_PRESSURE:.2f} bar",
+            R_FLOW: lambda v: f"{v / SCALE_FLOW:.1f} m³/h",
+            R_STATIC_HEAD: lambda v: f"{v / SCALE_STATIC_HEAD:.1f} m",
+            R_FRICTION: lambda v: f"{v / SCALE_FRICTION:.1f} m",
+            R_DIAMETER: '{} mm'.format,
+            R_ELEV: lambda v: f"{v / SCALE_ELEV:.1f} m",
+        }
+        
+        # Add registers to treeview, keeping each row's iid for in-place
+        # updates and the raw value last written to each row
+        self._tree_iids = {}
+        self._last_displayed = {}
+        for reg in _MONITORED_REGS:
+            value = self.register_values[reg]
+            self._tree_iids[reg] = self.tree.insert('', 'end', values=(
+                str(reg), self._tree_labels[reg], self._formatters[reg](value), value))
+            self._last_displayed[reg] = value
     
-    def draw_pump(self, running=False):
-        self.pump_canvas.delete("all")
+    def _build_pump_static(self):
+        # Every pump shape is created once; draw_pump only shows or hides them
+        canvas = self.pump_canvas
         
         # Draw pump body
-        self.pump_canvas.create_oval(20, 50, 130, 130, width=2, outline='black')
+        canvas.create_oval(20, 50, 130, 130, width=2, outline='black')
         
         # Draw inlet and outlet pipes
-        self.pump_canvas.create_line(0, 90, 20, 90, width=4)
-        self.pump_canvas.create_line(130, 90, 150, 90, width=4)
-        
-        # Draw impeller
-        if running:
-            # Animated impeller (rotating)
-            self.pump_canvas.create_arc(40, 70, 110, 110, start=30, extent=60, style=tk.PIESLICE, fill='green')
-            self.pump_canvas.create_arc(40, 70, 110, 110, start=150, extent=60, style=tk.PIESLICE, fill='green')
-            self.pump_canvas.create_arc(40, 70, 110, 110, start=270, extent=60, style=tk.PIESLICE, fill='green')
-            
-            # Flow indicators
-            self.pump_canvas.create_polygon(130, 85, 140, 80, 140, 90, fill='blue')
-            
-            # Running text
-            self.pump_canvas.create_text(75, 30, text="RUNNING", fill="green", font=("Arial", 12, "bold"))
-        else:
-            # Static impeller
-            self.pump_canvas.create_arc(40, 70, 110, 110, start=0, extent=60, style=tk.PIESLICE, fill='red')
-            self.pump_canvas.create_arc(40, 70, 110, 110, start=120, extent=60, style=tk.PIESLICE, fill='red')
-            self.pump_canvas.create_arc(40, 70, 110, 110, start=240, extent=60, style=tk.PIESLICE, fill='red')
-            
-            # Stopped text
-            self.pump_canvas.create_text(75, 30, text="STOPPED", fill="red", font=("Arial", 12, "bold"))
+        canvas.create_line(0, 90, 20, 90, width=4)
+        canvas.create_line(130, 90, 150, 90, width=4)
+        
+        # Running impeller, flow indicator and text
+        for start in (30, 150, 270):
+            canvas.create_arc(40, 70, 110, 110, start=start, extent=60, style=tk.PIESLICE, fill='green',
+                              state=tk.HIDDEN, tags='running')
+        canvas.create_polygon(130, 85, 140, 80, 140, 90, fill='blue', state=tk.HIDDEN, tags='running')
+        canvas.create_text(75, 30, text="RUNNING", fill="green", font=("Arial", 12, "bold"),
+                           state=tk.HIDDEN, tags='running')
+        
+        # Static impeller and stopped text
+        for start in (0, 120, 240):
+            canvas.create_arc(40, 70, 110, 110, start=start, extent=60, style=tk.PIESLICE, fill='red',
+                              state=tk.HIDDEN, tags='stopped')
+        canvas.create_text(75, 30, text="STOPPED", fill="red", font=("Arial", 12, "bold"),
+                           state=tk.HIDDEN, tags='stopped')
+        
+        self._pump_drawn_running = None
+    
+    def draw_pump(self, running=False):
+        if running == self._pump_drawn_running:
+            return
+        self._pump_drawn_running = running
+        
+        self.pump_canvas.itemconfig('running', state=tk.NORMAL if running else tk.HIDDEN)
+        self.pump_canvas.itemconfig('stopped', state=tk.HIDDEN if running else tk.NORMAL)
     
     def toggle_server(self):
-        if not self.server_running:
+        if self.server_thread is None or not self.server_thread.is_alive():
             self.start_server()
         else:
             self.stop_server()
@@ -376,386 +518,384 @@ class PLCSimulator:
             # Disable server controls
             self.server_button.config(text="Stop Server")
             self.status_label.config(text="Server: Starting...", foreground="orange")
-            self.root.update()
+            # Only repaint the labels; update() would also run queued callbacks
+            self.root.update_idletasks()
             
             # Start Modbus server in a separate thread
-            self.server_running = True
-            self.server_thread = threading.Thread(target=self.run_server)
+            self._server_stop.clear()
+            self._server_error = None
+            address = (self.ip_address.get(), self.port.get())
+            self.server_thread = threading.Thread(target=self.run_server, args=(address,))
             self.server_thread.daemon = True
             self.server_thread.start()
             
             self.status_label.config(text="Server: Running", foreground="green")
+            if self._watch_after_id is not None:
+                self.root.after_cancel(self._watch_after_id)  # Still watching the previous thread
+            self._watch_server()
         except Exception as e:
             messagebox.showerror("Server Error", f"Failed to start server: {str(e)}")
             self.server_button.config(text="Start Server")
             self.status_label.config(text="Server: Error", foreground="red")
-            self.server_running = False
     
-    def run_server(self):
+    def run_server(self, address):
+        try:
+            asyncio.run(self._serve(address))
+        except Exception as e:
+            log.error("Server error: %s", e)
+            self._server_error = e  # Reported by _watch_server on the Tk thread
+        finally:
+            self._server_loop = None
+            self._serve_task = None
+    
+    async def _serve(self, address):
+        # A single event loop on the server thread handles every client connection
+        self._server_loop = asyncio.get_running_loop()
+        self._serve_task = asyncio.current_task()
+        if self._server_stop.is_set():
+            return  # stop_server ran before the loop was published
+        
+        server = None
         try:
-            StartTcpServer(
+            server = await StartAsyncTcpServer(
                 context=self.context,
-                address=(self.ip_address.get(), self.port.get())
+                address=address,
+                allow_reuse_address=True
             )
-        except Exception as e:
-            print(f"Server error: {str(e)}")
-            self.server_running = False
+            await server.serve_forever()
+        except asyncio.CancelledError:
+            pass  # Cancelled by stop_server
+        finally:
+            if server is not None and server.server is not None:
+                # pymodbus's handlers swallow CancelledError and keep reading
+                # until their connection is lost, so end each session and
+                # close its socket before cancelling the handler tasks
+                handlers = list(server.active_connections.values())
+                for handler in handlers:
+                    handler.running = False
+                    handler.transport.close()
+                # Release the port and cancel the session handlers
+                server.server_close()
+                await asyncio.gather(*(h.handler_task for h in handlers), return_exceptions=True)
     
     def stop_server(self):
-        # Note: This doesn't actually stop the server thread cleanly
-        # In a real application, you'd want a better shutdown mechanism
-        self.server_running = False
+        if self._server_stop.is_set():
+            return  # Already stopping
+        
+        # Cancel the serving task on the server's own loop; the loop may
+        # already be closed if the server failed to bind
+        self._server_stop.set()
+        loop, task = self._server_loop, self._serve_task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Event loop is closed
+        
+        self.server_button.config(text="Start Server")
+        self.status_label.config(text="Server: Stopping...", foreground="orange")
+        if self._watch_after_id is None:
+            self._watch_server()  # Thread already ended; nothing to wait for
+    
+    def _watch_server(self):
+        # Poll rather than join so the UI keeps running while the server
+        # thread closes its sessions and releases the port
+        if self.server_thread is not None and self.server_thread.is_alive():
+            self._watch_after_id = self.root.after(100, self._watch_server)
+            return
+        self._watch_after_id = None
+        
         self.server_button.config(text="Start Server")
-        self.status_label.config(text="Server: Stopped", foreground="red")
-        messagebox.showinfo("Server Stopped", 
-                           "The server has been requested to stop. You may need to restart the application to start it again.")
+        if self._server_stop.is_set():
+            self.status_label.config(text="Server: Stopped", foreground="red")
+        else:
+            # The server thread ended on its own, e.g. the port was taken
+            self.status_label.config(text="Server: Error", foreground="red")
+            messagebox.showerror("Server Error", f"Server stopped: {self._server_error}")
     
     def update_register_from_slider(self, control_type):
-        if control_type == 'temp':
-            value = self.temp_var.get()
-            raw_value = int(value * 10)  # Scale for PLC (25.0°C = 250)
-            self.register_values[10] = raw_value
-            self.temp_display.config(text=f"{value:.1f}")
-            self.store.setValues(3, 10, [raw_value])
-            
-        elif control_type == 'pressure':
-            value = self.pressure_var.get()
-            raw_value = int(value * 100)  # Scale for PLC (3.00 bar = 300)
-            self.register_values[11] = raw_value
-            self.pressure_display.config(text=f"{value:.2f}")
-            self.store.setValues(3, 11, [raw_value])
-            
-        elif control_type == 'flow':
-            value = self.flow_var.get()
-            raw_value = int(value * 10)  # Scale for PLC (15.0 m³/h = 150)
-            self.register_values[12] = raw_value
-            self.flow_display.config(text=f"{value:.1f}")
-            self.store.setValues(3, 12, [raw_value])
-            
-        elif control_type == 'static_head':
-            value = self.static_head_var.get()
-            raw_value = int(value * 10)  # Scale for PLC (2.0 m = 20)
-            self.register_values[13] = raw_value
-            self.static_head_display.config(text=f"{value:.1f}")
-            self.store.setValues(3, 13, [raw_value])
-            
-        elif control_type == 'friction_loss':
-            value = self.friction_loss_var.get()
-            raw_value = int(value * 10)  # Scale for PLC (0.5 m = 5)
-            self.register_values[14] = raw_value
-            self.friction_loss_display.config(text=f"{value:.1f}")
-            self.store.setValues(3, 14, [raw_value])
-            
-        elif control_type == 'pipe_diameter':
-            value = self.pipe_diameter_var.get()
-            raw_value = int(value)  # No scaling needed
-            self.register_values[15] = raw_value
-            self.pipe_diameter_display.config(text=f"{value:.0f}")
-            self.store.setValues(3, 15, [raw_value])
-            
-        elif control_type == 'elevation':
-            value = self.elevation_var.get()
-            raw_value = int(value * 10)  # Scale for PLC (1.0 m = 10)
-            self.register_values[16] = raw_value
-            self.elevation_display.config(text=f"{value:.1f}")
-            self.store.setValues(3, 16, [raw_value])
+        # Slider drags call this once per pixel of motion, so only remember
+        # the latest value per control and apply them together when idle
+        self._pending[control_type] = self._controls[control_type].var.get()
+        if self._flush_after_id is None:
+            self._flush_after_id = self.root.after_idle(self._flush_pending)
+    
+    def _flush_pending(self):
+        if self._flush_after_id is not None:
+            self.root.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        
+        for control_type, raw_value in pending.items():
+            spec = self._controls[control_type]
+            self.register_values[spec.reg] = raw_value
+            self._last_reg[spec.reg] = raw_value
+            self._set_label(spec.display, format(raw_value / spec.scale, spec.fmt))
+            self._hr_values[spec.reg] = raw_value
+        self._dirty = True
         
         # Calculate and update NPSH values
         self.calculate_npsh()
     
+    def _set_label(self, label, text):
+        # Skip the Tk call when the label already shows this text
+        if self._label_text.get(label) != text:
+            self._label_text[label] = text
+            label.config(text=text)
+    
     def calculate_npsh(self):
-        """Calculate NPSH values for display in the UI"""
+        """Calculate NPSH values from the register values for display in the UI"""
         try:
-            temp = self.temp_var.get()
-            pressure = self.pressure_var.get()
-            flow = self.flow_var.get()
-            
-            # Simple vapor pressure calculation (approximate)
-            vapor_pressure = 0.0061 * (1.8 * temp + 32) ** 2 / 100  # in bar
+            register_values = self.register_values
             
-            # Convert pressure from bar to meters of water
-            pressure_m = pressure * 10.2  # approx. conversion
+            # The result only depends on these inputs, which rarely change
+            inputs = (register_values[R_TEMP] / SCALE_TEMP,
+                      register_values[R_PRESSURE] / SCALE_PRESSURE,
+                      register_values[R_FLOW] / SCALE_FLOW,
+                      register_values[R_STATIC_HEAD] / SCALE_STATIC_HEAD,
+                      register_values[R_FRICTION] / SCALE_FRICTION)
+            if inputs == self._npsh_inputs:
+                return
             
-            # Get static head and friction losses
-            static_head = self.static_head_var.get()
-            friction_loss = self.friction_loss_var.get()
+            npsha, npshr, margin = compute_npsh(*inputs)
+            self._npsh_inputs = inputs
             
-            # Calculate NPSHa
-            npsha = pressure_m - (vapor_pressure * 10.2) + static_head - friction_loss
+            # Update display, skipping values whose rounded form hasn't changed
+            rounded = round(npsha, 2)
+            if rounded != self._last_npsha:
+                self._last_npsha = rounded
+                self.npsha_var.set(f"{npsha:.2f} m")
             
-            # Use the 8x15DMX-3 NPSHr curve - matches the JavaScript implementation
-            if flow <= 0:
-                npshr = 0.5
-            elif flow <= 100:
-                npshr = 0.5 + (flow / 100) * 2.7  # Interpolate between 0.5 and 3.2
-            elif flow <= 200:
-                npshr = 3.2 + (flow - 100) / 100 * 2.8  # Between 3.2 and 6.0
-            elif flow <= 300:
-                npshr = 6.0 + (flow - 200) / 100 * 3.1  # Between 6.0 and 9.1
-            elif flow <= 400:
-                npshr = 9.1 + (flow - 300) / 100 * 3.3  # Between 9.1 and 12.4
-            elif flow <= 480:
-                npshr = 12.4 + (flow - 400) / 80 * 4.0  # Between 12.4 and 16.4
-            elif flow <= 550:
-                npshr = 16.4 + (flow - 480) / 70 * (-0.6)  # Between 16.4 and 15.8
-            elif flow <= 650:
-                npshr = 15.8 + (flow - 550) / 100 * (-0.8)  # Between 15.8 and 15.0
-            elif flow <= 750:
-                npshr = 15.0 + (flow - 650) / 100 * (-0.8)  # Between 15.0 and 14.2
-            elif flow <= 850:
-                npshr = 14.2 + (flow - 750) / 100 * (-0.2)  # Between 14.2 and 14.0
-            elif flow <= 950:
-                npshr = 14.0 + (flow - 850) / 100 * 0.4  # Between 14.0 and 14.4
-            elif flow <= 1050:
-                npshr = 14.4 + (flow - 950) / 100 * 0.8  # Between 14.4 and 15.2
-            elif flow <= 1100:
-                npshr = 15.2 + (flow - 1050) / 50 * 0.8  # Between 15.2 and 16.0
-            elif flow <= 1150:
-                npshr = 16.0 + (flow - 1100) / 50 * 1.5  # Between 16.0 and 17.5
-            elif flow <= 1200:
-                npshr = 17.5 + (flow - 1150) / 50 * 1.5  # Between 17.5 and 19.0
-            else:
-                npshr = 19.0 + (flow - 1200) / 100 * 2.0  # Extrapolate beyond 1200
-            
-            # Calculate margin
-            margin = npsha - npshr
-            
-            # Update display
-            self.npsha_var.set(f"{npsha:.2f} m")
-            self.npshr_var.set(f"{npshr:.2f} m")
+            rounded = round(npshr, 2)
+            if rounded != self._last_npshr:
+                self._last_npshr = rounded
+                self.npshr_var.set(f"{npshr:.2f} m")
             
-            if margin >= 0:
-                self.margin_var.set(f"{margin:.2f} m ✅")
-            else:
-                self.margin_var.set(f"{margin:.2f} m ⚠️")
+            rounded = (round(margin, 2), margin >= 0)
+            if rounded != self._last_margin:
+                self._last_margin = rounded
+                if margin >= 0:
+                    self.margin_var.set(f"{margin:.2f} m ✅")
+                else:
+                    self.margin_var.set(f"{margin:.2f} m ⚠️")
                 
         except Exception as e:
-            print(f"Error calculating NPSH: {str(e)}")
+            log.error("Error calculating NPSH: %s", e)
     
     def manual_pump_control(self, start=True):
         if start:
-            self.register_values[1] = 1  # Command to start
-            self.register_values[2] = 1  # Status as running
+            self.register_values[R_PUMP_CTRL] = 1  # Command to start
+            self.register_values[R_PUMP_STATUS] = 1  # Status as running
             
             # Set a realistic flow rate when pump starts - specific to 8x15DMX-3
-            if self.register_values[12] < 100:  # If flow rate is too low
-                self.flow_var.set(random.uniform(200, 600))  # Set flow in the POR range
+            if self.register_values[R_FLOW] < 10 * SCALE_FLOW:  # If flow rate is too low
+                self.flow_var.set(int(random.uniform(200, 600) * SCALE_FLOW))  # Set flow in the POR range
                 self.update_register_from_slider('flow')
         else:
-            self.register_values[1] = 0  # Command to stop
-            self.register_values[2] = 0  # Status as stopped
+            self.register_values[R_PUMP_CTRL] = 0  # Command to stop
+            self.register_values[R_PUMP_STATUS] = 0  # Status as stopped
             
             # Flow drops to zero when pump stops
             self.flow_var.set(0)
             self.update_register_from_slider('flow')
         
-        # Update the Modbus registers
-        self.store.setValues(3, 1, [self.register_values[1]])
-        self.store.setValues(3, 2, [self.register_values[2]])
+        # Update the Modbus registers (control and status are adjacent)
+        self._hr_values[R_PUMP_CTRL:R_PUMP_STATUS + 1] = self.register_values[R_PUMP_CTRL:R_PUMP_STATUS + 1]
+        self._dirty = True
     
     def update_ui(self):
+        # Registers are polled more often than the widgets are redrawn
+        self._next_poll = self._next_redraw = time.monotonic()
+        self._poll_registers()
+        self._redraw_ui()
+    
+    def _schedule(self, deadline, interval_ms, callback):
+        # Time each run from the previous deadline rather than from when the
+        # callback finished, so its own runtime doesn't stretch the period
+        now = time.monotonic()
+        deadline += interval_ms / 1000
+        if deadline < now:
+            # Fell more than a period behind; start over instead of bursting
+            deadline = now + interval_ms / 1000
+        self.root.after(int((deadline - now) * 1000), callback)
+        return deadline
+    
+    def _poll_registers(self):
+        # Reschedule first so an exception below can't end the poll loop
+        self._next_poll = self._schedule(self._next_poll, POLL_INTERVAL_MS, self._poll_registers)
+        
+        # Write out pending slider moves before reading the store back
+        self._flush_pending()
+        
+        register_values = self.register_values
+        
         # Detect changes to pump control register
-        previous_pump_control = self.register_values[1]
+        previous_pump_control = register_values[R_PUMP_CTRL]
         
-        # Read current values from the context
-        for reg in self.register_values.keys():
-            try:
-                # Add more error checking when reading from store
-                value = self.store.getValues(3, reg, 1)[0]
-                
-                # Print debug info if the pump control register changes
-                if reg == 1 and value != self.register_values[1]:
-                    print(f"Pump control register changed from {self.register_values[1]} to {value}")
-                    # Remember the new value for use after the loop
-                    new_pump_control = value
-                    
-                self.register_values[reg] = value
-                
-                # If pump control register (1) is changed, update pump status register (2)
-                if reg == 1:
-                    # Ensure pump status matches pump control
-                    self.register_values[2] = value
-                    self.store.setValues(3, 2, [value])
-                    print(f"Updated pump status to {value} to match pump control")
-            except Exception as e:
-                print(f"Error reading register {reg}: {str(e)}")
+        # Registers 1-12 (pump, temperature, pressure, flow) are read every
+        # poll in one call; the slow registers take turns after them
+        slow_reg = self._slow_regs[0]
+        self._slow_regs.rotate(-1)
+        try:
+            values = self.store.getValues(3, R_PUMP_CTRL, R_FLOW)
+            slow_value = self.store.getValues(3, slow_reg, 1)[0]
+        except Exception as e:
+            log.error("Error reading registers: %s", e)
+            values = None
+        
+        if values is not None:
+            # Print debug info if the pump control register changes
+            if values[0] != register_values[R_PUMP_CTRL]:
+                log.info("Pump control register changed from %s to %s", register_values[R_PUMP_CTRL], values[0])
+            
+            if values != register_values[R_PUMP_CTRL:R_FLOW + 1]:
+                register_values[R_PUMP_CTRL:R_FLOW + 1] = values
+                self._dirty = True
+            if slow_value != register_values[slow_reg]:
+                register_values[slow_reg] = slow_value
+                self._dirty = True
+            
+            # Ensure pump status matches pump control; they normally agree
+            if values[1] != values[0]:
+                register_values[R_PUMP_STATUS] = values[0]
+                self._hr_values[R_PUMP_STATUS] = values[0]
+                log.debug("Updated pump status to %s to match pump control", values[0])
         
         # Check if pump control changed from external source (like the website)
-        if previous_pump_control != self.register_values[1]:
-            if self.register_values[1] == 1:  # Pump starting
+        if previous_pump_control != self.register_values[R_PUMP_CTRL]:
+            if self.register_values[R_PUMP_CTRL] == 1:  # Pump starting
                 # Set a realistic flow rate when pump starts from external command
-                if self.register_values[12] < 100:  # If flow rate is too low
-                    print("External pump start detected - setting realistic flow rate")
-                    self.flow_var.set(random.uniform(200, 600))  # Set flow in the POR range
+                if self.register_values[R_FLOW] < 10 * SCALE_FLOW:  # If flow rate is too low
+                    log.info("External pump start detected - setting realistic flow rate")
+                    self.flow_var.set(int(random.uniform(200, 600) * SCALE_FLOW))  # Set flow in the POR range
                     self.update_register_from_slider('flow')
             else:  # Pump stopping
                 # Flow drops to zero when pump stops from external command
-                print("External pump stop detected - setting flow to zero")
+                log.info("External pump stop detected - setting flow to zero")
                 self.flow_var.set(0)
                 self.update_register_from_slider('flow')
-                
-        # Update the pump visualization based on status
-        pump_running = self.register_values[2] == 1
-        self.draw_pump(running=pump_running)
-        
-        # Update buttons based on pump state
-        if pump_running:
-            self.start_button.state(['disabled'])
-            self.stop_button.state(['!disabled'])
-        else:
-            self.start_button.state(['!disabled'])
-            self.stop_button.state(['disabled'])
+            
+            # Apply the new flow before the sliders are synced to the registers
+            self._flush_pending()
+    
+    def _redraw_ui(self):
+        self._next_redraw = self._schedule(self._next_redraw, REDRAW_INTERVAL_MS, self._redraw_ui)
+        # Pending slider moves would otherwise be undone by the slider sync
+        self._flush_pending()
+        if not self._dirty:
+            return  # Nothing changed since the last redraw
+        self._dirty = False
+        
+        register_values = self.register_values
+        
+        # Update the pump visualization and buttons when the pump state flips
+        pump_running = register_values[R_PUMP_STATUS] == 1
+        if pump_running != self._last_pump_running:
+            self._last_pump_running = pump_running
+            self.draw_pump(running=pump_running)
+            if pump_running:
+                self.start_button.state(['disabled'])
+                self.stop_button.state(['!disabled'])
+            else:
+                self.start_button.state(['!disabled'])
+                self.stop_button.state(['disabled'])
         
         # Update treeview
-        for i, (reg, value) in enumerate(self.register_values.items()):
-            if i >= len(self.tree.get_children()):
-                continue  # Skip if there are more registers than tree items
-                
-            item_id = self.tree.get_children()[i]
+        for reg in _MONITORED_REGS:
+            value = register_values[reg]
+            if value == self._last_displayed.get(reg):
+                continue  # Row already shows this value
+            self._last_displayed[reg] = value
             
-            if reg == 1:  # Pump Control
-                display_value = f"{'1 (Start)' if value == 1 else '0 (Stop)'}"
-            elif reg == 2:  # Pump Status
-                display_value = f"{'1 (Running)' if value == 1 else '0 (Stopped)'}"
-            elif reg == 10:  # Temperature
-                display_value = f"{value / 10:.1f} °C"
-            elif reg == 11:  # Pressure
-                display_value = f"{value / 100:.2f} bar"
-            elif reg == 12:  # Flow rate
-                display_value = f"{value / 10:.1f} m³/h"
-            elif reg == 13:  # Static head
-                display_value = f"{value / 10:.1f} m"
-            elif reg == 14:  # Friction losses
-                display_value = f"{value / 10:.1f} m"
-            elif reg == 15:  # Pipe diameter
-                display_value = f"{value} mm"
-            elif reg == 16:  # Elevation
-                display_value = f"{value / 10:.1f} m"
-            else:
-                display_value = str(value)
+            display_value = self._formatters.get(reg, str)(value)
             
-            self.tree.item(item_id, values=(reg, self.tree.item(item_id)['values'][1], display_value, value))
+            # Rewrite the whole row in one Tk call rather than one per column
+            self.tree.item(self._tree_iids[reg], values=(str(reg), self._tree_labels[reg], display_value, value))
         
         # Update sliders to match register values
-        if not self.temp_var.get() * 10 == self.register_values[10]:
-            self.temp_var.set(self.register_values[10] / 10)
-            self.temp_display.config(text=f"{self.register_values[10] / 10:.1f}")
-            
-        if not self.pressure_var.get() * 100 == self.register_values[11]:
-            self.pressure_var.set(self.register_values[11] / 100)
-            self.pressure_display.config(text=f"{self.register_values[11] / 100:.2f}")
-            
-        if not self.flow_var.get() * 10 == self.register_values[12]:
-            self.flow_var.set(self.register_values[12] / 10)
-            self.flow_display.config(text=f"{self.register_values[12] / 10:.1f}")
-            
-        if not self.static_head_var.get() * 10 == self.register_values[13]:
-            self.static_head_var.set(self.register_values[13] / 10)
-            self.static_head_display.config(text=f"{self.register_values[13] / 10:.1f}")
-            
-        if not self.friction_loss_var.get() * 10 == self.register_values[14]:
-            self.friction_loss_var.set(self.register_values[14] / 10)
-            self.friction_loss_display.config(text=f"{self.register_values[14] / 10:.1f}")
-            
-        if not self.pipe_diameter_var.get() == self.register_values[15]:
-            self.pipe_diameter_var.set(self.register_values[15])
-            self.pipe_diameter_display.config(text=f"{self.register_values[15]}")
-            
-        if not self.elevation_var.get() * 10 == self.register_values[16]:
-            self.elevation_var.set(self.register_values[16] / 10)
-            self.elevation_display.config(text=f"{self.register_values[16] / 10:.1f}")
+        last_reg = self._last_reg
+        for spec in self._controls.values():
+            raw_value = register_values[spec.reg]
+            if last_reg.get(spec.reg) != raw_value:
+                last_reg[spec.reg] = raw_value
+                spec.var.set(raw_value)
+                self._set_label(spec.display, format(raw_value / spec.scale, spec.fmt))
         
         # Update NPSH calculations
         self.calculate_npsh()
-        
-        # Schedule the next update
-        self.root.after(500, self.update_ui)
 
     def stop_pump_request(self):
         """Handle pump stop request from the /plc/stop endpoint"""
         try:
-            print('Received stop pump request')
-            # Write 0 to register 1 (pump control)
-            result = self.store.setValues(3, 1, [0])
-            print('Stop pump result:', result)
-            
-            # Verify the write was successful by reading back the register
-            try:
-                verify_result = self.store.getValues(3, 1, 1)
-                new_value = verify_result[0]
-                print(f"Verified pump control register value after write: {new_value}")
-                
-                if new_value == 0:
-                    return {"success": True, "message": "Pump stopped successfully"}
-                else:
-                    return {"success": False, "message": "Pump control register was not updated"}
-            except Exception as verify_error:
-                print('Error verifying pump control register:', verify_error)
-                return {"success": True, "message": "Pump stop requested, but verification failed"}
+            log.info('Received stop pump request')
+            # Write 0 to register 1 (pump control); the next poll handles the
+            # stop like any other external command. The in-process store
+            # either raises here or holds the new value, so there is no
+            # need to read it back
+            self.store.setValues(3, R_PUMP_CTRL, [0])
+            return {"success": True, "message": "Pump stopped successfully"}
         except Exception as error:
-            print('Error stopping pump:', error)
+            log.error('Error stopping pump: %s', error)
             return {"success": False, "message": f"Error stopping pump: {str(error)}"}
     
+    def _setup_entry(self, entry_widget, control_type, min_val, max_val, is_int=False):
+        validator = self._make_validator(min_val, max_val, is_int)
+        self._entry_controls[str(entry_widget)] = EntrySpec(control_type, min_val, max_val, validator)
+        entry_widget.config(validate='key', validatecommand=self._vcmd)
+        entry_widget.bind('<Return>', self._commit_entry)
+        entry_widget.bind('<FocusOut>', self._commit_entry)
+    
+    def _validate_entry(self, value, widget_path):
+        return self._entry_controls[widget_path].validate(value)
+    
+    def _commit_entry(self, event):
+        spec = self._entry_controls[str(event.widget)]
+        self.update_from_entry(event.widget, spec.control_type, spec.min_val, spec.max_val)
+    
     @staticmethod
-    def validate_numeric_input(value, min_val, max_val):
-        if value == "":
-            return True
-        try:
-            float_val = float(value)
-            return min_val <= float_val <= max_val
-        except ValueError:
-            return False
+    def _make_validator(min_val, max_val, is_int=False):
+        # Built once per entry so each keystroke only checks its own bounds
+        if is_int:
+            def validate(value):
+                if value == "":
+                    return True
+                # Reject non-digits up front instead of letting int() raise
+                return value.isdecimal() and min_val <= int(value) <= max_val
+        else:
+            def validate(value):
+                if value == "":
+                    return True
+                try:
+                    return min_val <= float(value) <= max_val
+                except ValueError:
+                    return False
+        return validate
         
     # Update from Entry widget
     def update_from_entry(self, entry_widget, control_type, min_val, max_val):
+        spec = self._controls[control_type]
         try:
             value = float(entry_widget.get())
             if min_val <= value <= max_val:
                 # Update the variable which will also update the slider
-                if control_type == 'temp':
-                    self.temp_var.set(value)
-                elif control_type == 'pressure':
-                    self.pressure_var.set(value)
-                elif control_type == 'flow':
-                    self.flow_var.set(value)
-                elif control_type == 'static_head':
-                    self.static_head_var.set(value)
-                elif control_type == 'friction_loss':
-                    self.friction_loss_var.set(value)
-                elif control_type == 'pipe_diameter':
-                    self.pipe_diameter_var.set(value)
-                elif control_type == 'elevation':
-                    self.elevation_var.set(value)
+                spec.var.set(round(value * spec.scale))
             
             # Update the PLC register
             self.update_register_from_slider(control_type)
         except ValueError:
             # Reset to current value if not a valid number
-            if control_type == 'temp':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.temp_var.get():.1f}")
-            elif control_type == 'pressure':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.pressure_var.get():.2f}")
-            elif control_type == 'flow':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.flow_var.get():.1f}")
-            elif control_type == 'static_head':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.static_head_var.get():.1f}")
-            elif control_type == 'friction_loss':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.friction_loss_var.get():.1f}")
-            elif control_type == 'pipe_diameter':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.pipe_diameter_var.get():.0f}")
-            elif control_type == 'elevation':
-                entry_widget.delete(0, tk.END)
-                entry_widget.insert(0, f"{self.elevation_var.get():.1f}")
+            entry_widget.delete(0, tk.END)
+            entry_widget.insert(0, format(spec.var.get() / spec.scale, spec.fmt))
 
 # Add this at the very end of the file to create the main entry point:
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    # Set PLC_DEBUG to also log the per-poll register housekeeping
+    if os.environ.get('PLC_DEBUG'):
+        log.setLevel(logging.DEBUG)
     root = tk.Tk()
     app = PLCSimulator(root)
     root.mainloop()
\ No newline at end of file